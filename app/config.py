@@ -15,6 +15,12 @@ class BaseConfig:
         self.JWT_SECRET_KEY: Final[str] = self.env_getter.get_string(
             'JWT_SECRET', 'JWT secret key used for encryption/decryption of JWTs', required=True
         )
+        self.JWT_VERIFICATION_CACHE_SIZE: Final[int] = self.env_getter.get_int(
+            'JWT_VERIFICATION_CACHE_SIZE', 'Number of verified tokens kept in memory by each worker', required=False, default=4096
+        )
+        self.JWT_REVOCATION_SYNC_INTERVAL: Final[int] = self.env_getter.get_positive_int(
+            'JWT_REVOCATION_SYNC_INTERVAL', 'Seconds between two delta syncs of the revoked tokens', required=False, default=30
+        )
 
         # Database
         self.DB_USER: Final[str] = self.env_getter.get_string('DB_USER', 'Name of the database user', required=True)
@@ -24,6 +30,29 @@ class BaseConfig:
         self.DB_PORT: Final[str] = self.env_getter.get_string('DB_PORT', 'Port of the database', required=True)
         self.SQLALCHEMY_DATABASE_URI: Final[str] = f'postgresql://{self.DB_USER}:{self.DB_PASS}@{self.DB_IP}:{self.DB_PORT}/{self.DB_NAME}'
 
+        # Rate limiting
+        self.RATE_LIMIT_ENABLED: bool = (
+            self.env_getter.get_bool('RATE_LIMIT_ENABLED', 'Enable the rate limiter', required=False) is not False
+        )
+        self.RATE_LIMIT_BACKEND: Final[str] = (
+            self.env_getter.get_string('RATE_LIMIT_BACKEND', 'Token bucket storage: memory | postgres | redis', required=False) or 'memory'
+        )
+        self.RATE_LIMIT_REDIS_URL: Final[str] = self.env_getter.get_string(
+            'RATE_LIMIT_REDIS_URL', 'Url of the redis compatible store used by the redis backend', required=False
+        )
+
+        # Profile views, likes and fame
+        self.FAME_FLUSH_INTERVAL: Final[int] = self.env_getter.get_positive_int(
+            'FAME_FLUSH_INTERVAL', 'Max seconds a view or like stays in memory before being written', required=False, default=5
+        )
+        self.FAME_MAX_BUFFERED: Final[int] = self.env_getter.get_positive_int(
+            'FAME_MAX_BUFFERED', 'Number of buffered views and likes that triggers an early write', required=False, default=1000
+        )
+        self.FAME_VIEW_WEIGHT: Final[int] = self.env_getter.get_int(
+            'FAME_VIEW_WEIGHT', 'Fame earned per distinct viewer', required=False, default=1
+        )
+        self.FAME_LIKE_WEIGHT: Final[int] = self.env_getter.get_int('FAME_LIKE_WEIGHT', 'Fame earned per like', required=False, default=10)
+
         self.DEBUG: bool = self.env_getter.get_bool('DEBUG', required=False)
 
 
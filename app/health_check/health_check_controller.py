@@ -1,7 +1,7 @@
 from flask import Blueprint
 from managers.swagger_manager.doc_decorator import swagger
 from marshmallow import fields
-from setup import TestModel, db, docs
+from setup import TestModel, db, docs, limiter
 
 NAME = 'health_check'
 health_check_blueprint = Blueprint(f'{NAME}_blueprint', url_prefix='', import_name=__name__)
@@ -21,3 +21,26 @@ def do_health_check():
 
 
 docs.register_function(do_health_check, health_check_blueprint)
+
+
+@swagger(
+    responses={
+        200: {
+            'description': 'Requests rejected by the rate limiter since the worker started',
+            'content': {
+                'enabled': fields.Boolean(),
+                'backend': fields.String(),
+                'rejected': fields.Integer(),
+                'rejected_by_endpoint': fields.Dict(),
+                'backend_errors': fields.Integer(),
+                'user_key_errors': fields.Integer(),
+            },
+        },
+    },
+)
+@health_check_blueprint.get('/rate-limit')
+def get_rate_limit_stats():
+    return limiter.get_stats(), 200
+
+
+docs.register_function(get_rate_limit_stats, health_check_blueprint)
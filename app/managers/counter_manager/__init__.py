@@ -0,0 +1,3 @@
+from .event_counter import EventCounter
+
+__all__ = ['EventCounter']
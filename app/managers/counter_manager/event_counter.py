@@ -0,0 +1,217 @@
+import atexit
+import threading
+from collections import Counter
+
+import psycopg2
+from psycopg2.extras import execute_values
+from utils.daemon_thread import DaemonThread
+from utils.logger import get_console_logger
+
+counter_logger = get_console_logger('event_counter')
+
+
+class EventCounter:
+    """Buffers profile views and likes in memory and writes them in batches from a background thread.
+
+    profile_stats holds the number of distinct viewers, the like count and the fame of each profile, updated
+    by every flush, so reading a profile never aggregates profile_view or profile_like.
+
+    Loss bound: a worker crash loses the events buffered since the last successful flush, that is at most
+    `flush_interval` seconds of events, or `max_buffered` events since reaching it wakes the flusher early.
+    A normal interpreter exit flushes the buffer. While the database is unreachable the buffer is kept for
+    the next flush, up to twice `max_buffered` events per worker, beyond that new events are dropped and counted.
+    """
+
+    def __init__(self):
+        self.views: Counter[tuple[int, int]] = Counter()
+        self.likes: dict[tuple[int, int], bool] = {}
+        self.pending = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.lock = threading.Lock()
+        self.wake_up = threading.Event()
+        self.database = None
+        self.connection_params = None
+        self.flush_interval = 5
+        self.max_buffered = 1000
+        self.view_weight = 1
+        self.like_weight = 10
+        self.flusher = DaemonThread(self._flush_forever, 'event-counter-flusher')
+
+    def init_app(self, database_connection, config):
+        self.database = database_connection.database
+        self.connection_params = database_connection.get_connection_params()
+        self.flush_interval = config.FAME_FLUSH_INTERVAL
+        self.max_buffered = config.FAME_MAX_BUFFERED
+        self.view_weight = config.FAME_VIEW_WEIGHT
+        self.like_weight = config.FAME_LIKE_WEIGHT
+
+        with self.database.cursor() as cur:
+            cur.execute(
+                'CREATE TABLE IF NOT EXISTS public.profile_view ('
+                'id_viewer INTEGER NOT NULL, '
+                'id_viewed INTEGER NOT NULL, '
+                'view_count INTEGER NOT NULL, '
+                'last_viewed_at TIMESTAMPTZ NOT NULL DEFAULT now(), '
+                'PRIMARY KEY (id_viewed, id_viewer))'
+            )
+            cur.execute(
+                'CREATE TABLE IF NOT EXISTS public.profile_like ('
+                'id_liker INTEGER NOT NULL, '
+                'id_liked INTEGER NOT NULL, '
+                'liked_at TIMESTAMPTZ NOT NULL DEFAULT now(), '
+                'PRIMARY KEY (id_liked, id_liker))'
+            )
+            cur.execute(
+                'CREATE TABLE IF NOT EXISTS public.profile_stats ('
+                'id_profile INTEGER PRIMARY KEY, '
+                'view_count INTEGER NOT NULL DEFAULT 0, '
+                'like_count INTEGER NOT NULL DEFAULT 0, '
+                'fame INTEGER NOT NULL DEFAULT 0)'
+            )
+            cur.execute('CREATE INDEX IF NOT EXISTS profile_stats_fame_idx ON public.profile_stats (fame DESC)')
+            self.database.commit()
+            counter_logger.info('Tables profile_view, profile_like and profile_stats created')
+
+        atexit.register(self.flush)
+        self._ensure_flushing()
+
+    def record_view(self, id_viewer: int, id_viewed: int):
+        with self.lock:
+            if not self._reserve():
+                return
+            self.views[(id_viewer, id_viewed)] += 1
+        self._ensure_flushing()
+
+    def record_like(self, id_liker: int, id_liked: int, liked: bool = True):
+        with self.lock:
+            if not self._reserve():
+                return
+            self.likes[(id_liker, id_liked)] = liked
+        self._ensure_flushing()
+
+    def _reserve(self) -> bool:
+        if self.pending >= self.max_buffered * 2:
+            self.dropped += 1
+            return False
+        self.pending += 1
+        if self.pending >= self.max_buffered:
+            self.wake_up.set()
+        return True
+
+    def get_stats(self, id_profile: int) -> dict | None:
+        try:
+            with self.database.cursor() as cur:
+                cur.execute('SELECT view_count, like_count, fame FROM public.profile_stats WHERE id_profile = %s', (id_profile,))
+                row = cur.fetchone()
+                self.database.commit()
+        except Exception as e:
+            self.database.rollback()
+            counter_logger.error(f'An error occurred while fetching the stats of {id_profile}: {e}')
+            return None
+        if row is None:
+            return {'id_profile': id_profile, 'view_count': 0, 'like_count': 0, 'fame': 0}
+        return {'id_profile': id_profile, 'view_count': row[0], 'like_count': row[1], 'fame': row[2]}
+
+    def _ensure_flushing(self):
+        if self.connection_params is not None:
+            self.flusher.ensure_running()
+
+    def _flush_forever(self):
+        while True:
+            self.wake_up.wait(self.flush_interval)
+            self.wake_up.clear()
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            views, likes, pending = self.views, self.likes, self.pending
+            self.views, self.likes, self.pending = Counter(), {}, 0
+        if not pending:
+            return
+
+        try:
+            conn = psycopg2.connect(**self.connection_params)
+            try:
+                with conn, conn.cursor() as cur:
+                    self._write(cur, views, likes)
+            finally:
+                conn.close()
+            with self.lock:
+                self.flushed += pending
+        except Exception as e:
+            counter_logger.error(f'Could not flush {pending} profile events, keeping them for the next flush: {e}')
+            with self.lock:
+                for key, count in views.items():
+                    self.views[key] += count
+                for key, liked in likes.items():
+                    self.likes.setdefault(key, liked)
+                self.pending += pending
+
+    def _write(self, cur, views: Counter, likes: dict):
+        view_deltas = Counter()
+        like_deltas = Counter()
+
+        # Rows are sorted so that concurrent flushes from several workers lock them in the same order
+        # profile_view keeps the raw count, profile_stats counts each viewer once (xmax = 0 on a fresh insert)
+        # so that one account viewing a profile again and again does not raise its fame
+        if views:
+            rows = execute_values(
+                cur,
+                'INSERT INTO public.profile_view AS v (id_viewer, id_viewed, view_count) VALUES %s '
+                'ON CONFLICT (id_viewed, id_viewer) DO UPDATE SET '
+                'view_count = v.view_count + EXCLUDED.view_count, last_viewed_at = now() '
+                'RETURNING id_viewed, (xmax = 0)',
+                sorted((id_viewer, id_viewed, count) for (id_viewer, id_viewed), count in views.items()),
+                fetch=True,
+            )
+            for id_viewed, inserted in rows:
+                if inserted:
+                    view_deltas[id_viewed] += 1
+
+        # Only the likes that actually changed a row move the counters, liking twice counts once
+        added = sorted(key for key, liked in likes.items() if liked)
+        removed = sorted(key for key, liked in likes.items() if not liked)
+        if added:
+            rows = execute_values(
+                cur,
+                'INSERT INTO public.profile_like (id_liker, id_liked) VALUES %s ON CONFLICT DO NOTHING RETURNING id_liked',
+                added,
+                fetch=True,
+            )
+            for (id_liked,) in rows:
+                like_deltas[id_liked] += 1
+        if removed:
+            rows = execute_values(
+                cur,
+                'DELETE FROM public.profile_like WHERE (id_liker, id_liked) IN (VALUES %s) RETURNING id_liked',
+                removed,
+                fetch=True,
+            )
+            for (id_liked,) in rows:
+                like_deltas[id_liked] -= 1
+
+        profiles = sorted(set(view_deltas) | {id_profile for id_profile, delta in like_deltas.items() if delta})
+        if profiles:
+            execute_values(
+                cur,
+                'INSERT INTO public.profile_stats AS s (id_profile, view_count, like_count, fame) VALUES %s '
+                'ON CONFLICT (id_profile) DO UPDATE SET '
+                'view_count = s.view_count + EXCLUDED.view_count, '
+                'like_count = s.like_count + EXCLUDED.like_count, '
+                f'fame = (s.view_count + EXCLUDED.view_count) * {int(self.view_weight)} '
+                f'+ (s.like_count + EXCLUDED.like_count) * {int(self.like_weight)}',
+                [
+                    (
+                        id_profile,
+                        view_deltas[id_profile],
+                        like_deltas[id_profile],
+                        view_deltas[id_profile] * self.view_weight + like_deltas[id_profile] * self.like_weight,
+                    )
+                    for id_profile in profiles
+                ],
+            )
+
+    def get_counters(self):
+        with self.lock:
+            return {'pending': self.pending, 'flushed': self.flushed, 'dropped': self.dropped}
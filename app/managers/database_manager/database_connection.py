@@ -40,6 +40,15 @@ class DatabaseConnection:
             database_logger.error(f'Could not connect to database {self.name}: {e}')
             raise e
 
+    def get_connection_params(self):
+        return {
+            'host': self.ip,
+            'port': self.port,
+            'user': self.user,
+            'password': self.password,
+            'database': self.name,
+        }
+
     def health_check(self):
         try:
             with self.database.cursor() as cur:
@@ -0,0 +1,3 @@
+from .cached_jwt_manager import CachedJWTManager
+
+__all__ = ['CachedJWTManager']
@@ -0,0 +1,33 @@
+from flask import Flask
+from flask_jwt_extended import JWTManager
+
+from managers.jwt_manager.revocation_index import RevocationIndex
+from managers.jwt_manager.verification_cache import VerificationCache
+
+
+class CachedJWTManager(JWTManager):
+    """JWTManager that skips signature verification for tokens it has already verified and
+    checks the blocklist against an in-memory RevocationIndex"""
+
+    def __init__(self, app: Flask | None = None, add_context_processor: bool = False):
+        self.verification_cache = VerificationCache()
+        self.revocations = RevocationIndex()
+        super().__init__(app, add_context_processor)
+        self.token_in_blocklist_loader(lambda _, jwt_data: self.revocations.is_revoked(jwt_data['jti']))
+
+    def init_app(self, app: Flask, add_context_processor: bool = False):
+        super().init_app(app, add_context_processor)
+        self.verification_cache = VerificationCache(app.config.get('JWT_VERIFICATION_CACHE_SIZE', 4096))
+
+    def revoke(self, jwt_data: dict):
+        self.revocations.revoke(jwt_data['jti'], jwt_data.get('exp', float('inf')))
+
+    def _decode_jwt_from_config(self, encoded_token: str, csrf_value=None, allow_expired: bool = False) -> dict:
+        if csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        claims = self.verification_cache.get(encoded_token)
+        if claims is None:
+            claims = super()._decode_jwt_from_config(encoded_token)
+            self.verification_cache.put(encoded_token, claims)
+        return claims
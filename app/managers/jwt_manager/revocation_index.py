@@ -0,0 +1,132 @@
+import select
+import threading
+import time
+from contextlib import closing
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from utils.daemon_thread import DaemonThread
+from utils.logger import get_console_logger
+
+jwt_logger = get_console_logger('jwt_manager')
+
+
+class RevocationIndex:
+    """In-memory set of revoked jti, the request path never queries the database.
+
+    Revocations are written to the revoked_token table and broadcast with NOTIFY, a listener thread
+    per worker applies them. A delta sync on the same connection runs every `sync_interval` seconds
+    and after each reconnection, so a missed notification is picked up at the next sync.
+    """
+
+    TABLE = 'revoked_token'
+    CHANNEL = 'jwt_revoked'
+
+    def __init__(self):
+        self.revoked: dict[str, float] = {}
+        self.lock = threading.Lock()
+        self.database = None
+        self.connection_params = None
+        self.sync_interval = 30
+        self.last_revoked_at = None
+        self.listener = DaemonThread(self._listen, 'jwt-revocation-listener')
+        self.stopped = threading.Event()
+
+    def init_app(self, database_connection, sync_interval: int = 30):
+        self.database = database_connection.database
+        self.connection_params = database_connection.get_connection_params()
+        self.sync_interval = sync_interval
+
+        with self.database.cursor() as cur:
+            cur.execute(
+                f'CREATE TABLE IF NOT EXISTS public.{self.TABLE} ('
+                'jti VARCHAR(255) PRIMARY KEY, '
+                'expires_at DOUBLE PRECISION NOT NULL, '
+                'revoked_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp())'
+            )
+            cur.execute(f'CREATE INDEX IF NOT EXISTS {self.TABLE}_revoked_at_idx ON public.{self.TABLE} (revoked_at)')
+            self.database.commit()
+            jwt_logger.info(f'Table {self.TABLE} created')
+
+        self._sync(self.database)
+        self._ensure_listening()
+
+    def is_revoked(self, jti: str) -> bool:
+        self._ensure_listening()
+        with self.lock:
+            return jti in self.revoked
+
+    def revoke(self, jti: str, expires_at: float):
+        with self.lock:
+            self.revoked[jti] = expires_at
+        try:
+            with self.database.cursor() as cur:
+                cur.execute(
+                    f'INSERT INTO public.{self.TABLE} (jti, expires_at) VALUES (%s, %s) ON CONFLICT (jti) DO NOTHING',
+                    (jti, expires_at),
+                )
+                cur.execute('SELECT pg_notify(%s, %s)', (self.CHANNEL, f'{expires_at}:{jti}'))
+                self.database.commit()
+        except Exception as e:
+            self.database.rollback()
+            jwt_logger.error(f'Could not persist the revocation of {jti}: {e}')
+            raise e
+
+    def _ensure_listening(self):
+        if self.connection_params is not None:
+            self.listener.ensure_running()
+
+    def _listen(self):
+        while not self.stopped.is_set():
+            try:
+                # psycopg2's context manager only ends the transaction, closing() releases the connection
+                with closing(psycopg2.connect(**self.connection_params)) as conn:
+                    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                    with conn.cursor() as cur:
+                        cur.execute(f'LISTEN {self.CHANNEL}')
+                    self._sync(conn)
+                    last_sync = time.monotonic()
+                    while not self.stopped.is_set():
+                        timeout = max(0.0, last_sync + self.sync_interval - time.monotonic())
+                        if select.select([conn], [], [], timeout) != ([], [], []):
+                            conn.poll()
+                            while conn.notifies:
+                                expires_at, jti = conn.notifies.pop(0).payload.split(':', 1)
+                                with self.lock:
+                                    self.revoked[jti] = float(expires_at)
+                        # Notifications arriving faster than the interval must not starve the delta sync
+                        if time.monotonic() - last_sync >= self.sync_interval:
+                            self._sync(conn)
+                            last_sync = time.monotonic()
+            except Exception as e:
+                jwt_logger.error(f'Revocation listener disconnected, retrying in {self.sync_interval}s: {e}')
+                self.stopped.wait(self.sync_interval)
+
+    def _sync(self, conn):
+        now = time.time()
+        with conn.cursor() as cur:
+            cur.execute(f'DELETE FROM public.{self.TABLE} WHERE expires_at < %s', (now,))
+            if self.last_revoked_at is None:
+                cur.execute(f'SELECT jti, expires_at, revoked_at FROM public.{self.TABLE}')
+            else:
+                # revoked_at is set before commit, look back a little for rows committed after the last sync
+                cur.execute(
+                    f"SELECT jti, expires_at, revoked_at FROM public.{self.TABLE} WHERE revoked_at >= %s - INTERVAL '1 minute'",
+                    (self.last_revoked_at,),
+                )
+            rows = cur.fetchall()
+        if not conn.autocommit:
+            conn.commit()
+
+        with self.lock:
+            for jti, expires_at, revoked_at in rows:
+                self.revoked[jti] = expires_at
+                if self.last_revoked_at is None or revoked_at > self.last_revoked_at:
+                    self.last_revoked_at = revoked_at
+            for jti in [jti for jti, expires_at in self.revoked.items() if expires_at < now]:
+                del self.revoked[jti]
+
+    def get_stats(self):
+        with self.lock:
+            size = len(self.revoked)
+        return {'revoked': size, 'listening': self.listener.is_alive()}
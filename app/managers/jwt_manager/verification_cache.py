@@ -0,0 +1,47 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class VerificationCache:
+    """Bounded LRU of verified claims keyed by token hash, an entry is dropped once its token expires"""
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self.entries: OrderedDict[bytes, dict] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(encoded_token: str) -> bytes:
+        return hashlib.sha256(encoded_token.encode()).digest()
+
+    def get(self, encoded_token: str) -> dict | None:
+        key = self._key(encoded_token)
+        with self.lock:
+            claims = self.entries.get(key)
+            if claims is not None and 'exp' in claims and claims['exp'] <= time.time():
+                del self.entries[key]
+                claims = None
+            if claims is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        return dict(claims)
+
+    def put(self, encoded_token: str, claims: dict):
+        if self.max_size <= 0:
+            return
+        key = self._key(encoded_token)
+        with self.lock:
+            self.entries[key] = dict(claims)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def get_stats(self):
+        with self.lock:
+            return {'size': len(self.entries), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,5 @@
+from .rate_limit_decorator import rate_limit
+from .rate_limiter import RateLimiter
+from .token_bucket import RateLimit
+
+__all__ = ['RateLimit', 'RateLimiter', 'rate_limit']
@@ -0,0 +1,142 @@
+import os
+import threading
+import time
+
+import psycopg2
+from utils.logger import get_console_logger
+
+from managers.rate_limit_manager.token_bucket import BucketState, RateLimit, consume, refill
+
+rate_limit_logger = get_console_logger('rate_limit')
+
+
+class BucketBackend:
+    def hit(self, key: str, limit: RateLimit) -> BucketState:
+        raise NotImplementedError
+
+
+class MemoryBackend(BucketBackend):
+    """Buckets local to the worker, idle buckets are swept once they would be full again"""
+
+    SWEEP_EVERY = 1000
+
+    def __init__(self):
+        self.buckets: dict[str, tuple[float, float, int]] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+
+    def hit(self, key: str, limit: RateLimit) -> BucketState:
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated_at, _ = self.buckets.get(key, (float(limit.capacity), now, limit.period))
+            state = consume(refill(tokens, now - updated_at, limit), limit)
+            self.buckets[key] = (state.tokens, now, limit.period)
+
+            self.hits += 1
+            if self.hits % self.SWEEP_EVERY == 0:
+                self._sweep(now)
+        return state
+
+    def _sweep(self, now: float):
+        idle = [key for key, (_, updated_at, period) in self.buckets.items() if now - updated_at > period]
+        for key in idle:
+            del self.buckets[key]
+
+
+class PostgresBackend(BucketBackend):
+    """Buckets shared by every worker in an unlogged table, refilled and consumed in a single upsert.
+
+    The backend owns its autocommit connection, it never shares the ORM connection.
+    """
+
+    TABLE = 'rate_limit_bucket'
+    SWEEP_EVERY = 1000
+
+    def __init__(self, connection_params: dict):
+        self.connection_params = connection_params
+        self.connection = None
+        self.pid = None
+        self.lock = threading.Lock()
+        self.hits = 0
+        with self.lock, self._connect().cursor() as cur:
+            cur.execute(
+                f'CREATE UNLOGGED TABLE IF NOT EXISTS public.{self.TABLE} ('
+                'key VARCHAR(255) PRIMARY KEY, '
+                'tokens DOUBLE PRECISION NOT NULL, '
+                'allowed BOOLEAN NOT NULL, '
+                'updated_at DOUBLE PRECISION NOT NULL, '
+                'expires_at DOUBLE PRECISION NOT NULL)'
+            )
+            rate_limit_logger.info(f'Table {self.TABLE} created')
+
+    def _connect(self):
+        # Reconnect after a connection failure, and in each forked worker instead of sharing the parent socket
+        if self.connection is None or self.connection.closed or self.pid != os.getpid():
+            self.connection = psycopg2.connect(**self.connection_params)
+            self.connection.autocommit = True
+            self.pid = os.getpid()
+        return self.connection
+
+    def hit(self, key: str, limit: RateLimit) -> BucketState:
+        refilled = 'LEAST(%(capacity)s, b.tokens + (EXCLUDED.updated_at - b.updated_at) * %(rate)s)'
+        query = (
+            f'INSERT INTO public.{self.TABLE} AS b (key, tokens, allowed, updated_at, expires_at) '
+            'VALUES (%(key)s, %(capacity)s - 1, TRUE, EXTRACT(EPOCH FROM clock_timestamp()), '
+            'EXTRACT(EPOCH FROM clock_timestamp()) + %(period)s) '
+            'ON CONFLICT (key) DO UPDATE SET '
+            f'tokens = CASE WHEN {refilled} >= 1 THEN {refilled} - 1 ELSE {refilled} END, '
+            f'allowed = {refilled} >= 1, '
+            'updated_at = EXCLUDED.updated_at, '
+            'expires_at = EXCLUDED.expires_at '
+            'RETURNING tokens, allowed'
+        )
+        params = {'key': key, 'capacity': float(limit.capacity), 'rate': limit.refill_rate, 'period': limit.period}
+        with self.lock, self._connect().cursor() as cur:
+            cur.execute(query, params)
+            tokens, allowed = cur.fetchone()
+
+            # A bucket left alone for a whole period is full again, deleting it changes nothing for its client
+            self.hits += 1
+            if self.hits % self.SWEEP_EVERY == 0:
+                cur.execute(f'DELETE FROM public.{self.TABLE} WHERE expires_at < EXTRACT(EPOCH FROM clock_timestamp())')
+        if allowed:
+            return BucketState(allowed=True, tokens=tokens)
+        return BucketState(allowed=False, tokens=tokens, retry_after=(1 - tokens) / limit.refill_rate)
+
+
+class RedisBackend(BucketBackend):
+    """Buckets shared by every worker in a redis compatible store, updated atomically by a lua script"""
+
+    SCRIPT = """
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated_at = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(now - updated_at, 0) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError('The redis rate limit backend requires the `redis` package') from e
+
+        self.client = redis.Redis.from_url(url)
+        self.script = self.client.register_script(self.SCRIPT)
+
+    def hit(self, key: str, limit: RateLimit) -> BucketState:
+        allowed, tokens = self.script(keys=[f'rate_limit:{key}'], args=[limit.capacity, limit.refill_rate, time.time(), limit.period])
+        tokens = float(tokens)
+        if allowed:
+            return BucketState(allowed=True, tokens=tokens)
+        return BucketState(allowed=False, tokens=tokens, retry_after=(1 - tokens) / limit.refill_rate)
@@ -0,0 +1,25 @@
+from collections.abc import Callable
+
+from managers.rate_limit_manager.token_bucket import RateLimit
+
+
+def rate_limit_info(per_ip: RateLimit = None, per_user: RateLimit = None, user_key: Callable[[], str | None] = None):
+    if per_ip is None and per_user is None:
+        raise Exception('[rate_limit] At least one of per_ip or per_user is required')
+    if user_key is not None and per_user is None:
+        raise Exception('[rate_limit] user_key requires per_user')
+    return {'per_ip': per_ip, 'per_user': per_user, 'user_key': user_key}
+
+
+def rate_limit(per_ip: RateLimit = None, per_user: RateLimit = None, user_key: Callable[[], str | None] = None):
+    """Attach token buckets to a view, checked by the RateLimiter before the view runs.
+
+    `user_key` returns the identifier of the per-user bucket, it defaults to the JWT identity
+    (e.g. use the submitted username to throttle a login route).
+    """
+
+    def decorator(func):
+        func._rate_limit_info = rate_limit_info(per_ip, per_user, user_key)
+        return func
+
+    return decorator
@@ -0,0 +1,112 @@
+import math
+import threading
+from collections import defaultdict
+
+from config import BaseConfig
+from flask import Blueprint, Flask, current_app, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt import PyJWTError
+from utils.logger import get_console_logger
+
+from managers.rate_limit_manager.backends import BucketBackend, MemoryBackend, PostgresBackend, RedisBackend
+from managers.rate_limit_manager.rate_limit_decorator import rate_limit_info
+from managers.rate_limit_manager.token_bucket import RateLimit
+
+rate_limit_logger = get_console_logger('rate_limit')
+
+
+def jwt_identity():
+    try:
+        verify_jwt_in_request(optional=True)
+    except (JWTExtendedException, PyJWTError):
+        return None
+    identity = get_jwt_identity()
+    return None if identity is None else str(identity)
+
+
+class RateLimiter:
+    def __init__(self):
+        self.enabled = True
+        self.backend: BucketBackend | None = None
+        self.blueprints = {}
+        self.rejected = defaultdict(lambda: {'ip': 0, 'user': 0})
+        self.backend_errors = 0
+        self.user_key_errors = 0
+        self.lock = threading.Lock()
+
+    def init_app(self, app: Flask, config: BaseConfig, database_connection=None):
+        self.enabled = config.RATE_LIMIT_ENABLED
+        match config.RATE_LIMIT_BACKEND:
+            case 'memory':
+                self.backend = MemoryBackend()
+            case 'postgres':
+                self.backend = PostgresBackend(database_connection.get_connection_params())
+            case 'redis':
+                if not config.RATE_LIMIT_REDIS_URL:
+                    raise Exception('[rate_limit] RATE_LIMIT_REDIS_URL is required by the redis backend')
+                self.backend = RedisBackend(config.RATE_LIMIT_REDIS_URL)
+            case backend:
+                raise Exception(f'[rate_limit] Unknown backend {backend} (possible values): memory | postgres | redis')
+        rate_limit_logger.info(f'Using {config.RATE_LIMIT_BACKEND} backend (enabled: {self.enabled})')
+
+        app.before_request(self.check_request)
+
+    def limit_blueprint(self, blueprint: Blueprint, per_ip: RateLimit = None, per_user: RateLimit = None, user_key=None):
+        """Share one set of buckets between every view of the blueprint, views decorated with @rate_limit use their own"""
+        self.blueprints[blueprint.name] = rate_limit_info(per_ip, per_user, user_key)
+
+    def check_request(self):
+        # CORS preflights are sent by the browser before the real call, they must not spend its tokens
+        if not self.enabled or request.endpoint is None or request.method == 'OPTIONS':
+            return None
+
+        view = current_app.view_functions.get(request.endpoint)
+        info, bucket_name = getattr(view, '_rate_limit_info', None), request.endpoint
+        if info is None:
+            info, bucket_name = self.blueprints.get(request.blueprint), request.blueprint
+        if info is None:
+            return None
+
+        checks = []
+        if info['per_ip'] is not None:
+            checks.append(('ip', request.remote_addr, info['per_ip']))
+        if info['per_user'] is not None:
+            try:
+                user = (info['user_key'] or jwt_identity)()
+            except Exception as e:
+                # e.g. a login body without the username, the view answers it and the ip bucket still applies
+                with self.lock:
+                    self.user_key_errors += 1
+                rate_limit_logger.warning(f'Rate limit user_key of {request.endpoint} failed, user bucket skipped: {e}')
+                user = None
+            if user is not None:
+                checks.append(('user', user, info['per_user']))
+
+        for scope, identifier, limit in checks:
+            try:
+                state = self.backend.hit(f'{scope}:{bucket_name}:{identifier}', limit)
+            except Exception as e:
+                with self.lock:
+                    self.backend_errors += 1
+                rate_limit_logger.error(f'Rate limit backend failed, request let through: {e}')
+                return None
+            if not state.allowed:
+                with self.lock:
+                    self.rejected[request.endpoint][scope] += 1
+                return {'msg': 'Too many requests'}, 429, {'Retry-After': str(math.ceil(state.retry_after))}
+        return None
+
+    def get_stats(self):
+        with self.lock:
+            by_endpoint = {endpoint: dict(counters) for endpoint, counters in self.rejected.items()}
+            backend_errors = self.backend_errors
+            user_key_errors = self.user_key_errors
+        return {
+            'enabled': self.enabled,
+            'backend': self.backend.__class__.__name__ if self.backend else None,
+            'rejected': sum(counters['ip'] + counters['user'] for counters in by_endpoint.values()),
+            'rejected_by_endpoint': by_endpoint,
+            'backend_errors': backend_errors,
+            'user_key_errors': user_key_errors,
+        }
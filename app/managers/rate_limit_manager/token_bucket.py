@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Token bucket of `capacity` tokens, fully refilled every `period` seconds"""
+
+    capacity: int
+    period: int
+
+    def __post_init__(self):
+        if self.capacity < 1:
+            raise ValueError(f'[rate_limit] capacity must be at least 1, got {self.capacity}')
+        if self.period <= 0:
+            raise ValueError(f'[rate_limit] period must be positive, got {self.period}')
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+
+@dataclass(frozen=True)
+class BucketState:
+    allowed: bool
+    tokens: float
+    retry_after: float = 0.0
+
+
+def refill(tokens: float, elapsed: float, limit: RateLimit) -> float:
+    return min(float(limit.capacity), tokens + max(elapsed, 0.0) * limit.refill_rate)
+
+
+def consume(tokens: float, limit: RateLimit) -> BucketState:
+    if tokens >= 1:
+        return BucketState(allowed=True, tokens=tokens - 1)
+    return BucketState(allowed=False, tokens=tokens, retry_after=(1 - tokens) / limit.refill_rate)
@@ -4,13 +4,15 @@ import sys
 from config import config
 from flask import Flask
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager
+from managers.counter_manager import EventCounter
 from managers.database_manager.database_connection import DatabaseConnection, ModelInterface
+from managers.jwt_manager import CachedJWTManager
+from managers.rate_limit_manager import RateLimiter
 from managers.swagger_manager import SwaggerInterface
 from managers.swagger_manager.swagger_interface import SwaggerParams
 from utils.logger import get_console_logger, setup_loggers_color
 
-jwt: JWTManager = JWTManager()
+jwt: CachedJWTManager = CachedJWTManager()
 setup_loggers_color()
 
 matcha_logger = get_console_logger('matcha_info')
@@ -31,6 +33,8 @@ PARAMS = SwaggerParams(
     },
 )
 docs: SwaggerInterface = SwaggerInterface(PARAMS)
+limiter: RateLimiter = RateLimiter()
+counter: EventCounter = EventCounter()
 
 
 class TestModel(ModelInterface):
@@ -52,8 +56,10 @@ def create_app():
     app.logger.info(f'Using environment {config.ENV}')
 
     from health_check import health_check_blueprint
+    from user_profile import profile_blueprint
 
     app.register_blueprint(health_check_blueprint)
+    app.register_blueprint(profile_blueprint)
 
     docs.init_app(app)
 
@@ -61,4 +67,9 @@ def create_app():
 
     db.create_table()
 
+    jwt.revocations.init_app(db, config.JWT_REVOCATION_SYNC_INTERVAL)
+    counter.init_app(db, config)
+
+    limiter.init_app(app, config, db)
+
     return app
@@ -0,0 +1,3 @@
+from .user_profile_controller import profile_blueprint
+
+__all__ = ['profile_blueprint']
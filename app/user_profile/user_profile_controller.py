@@ -0,0 +1,101 @@
+from flask import Blueprint
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from managers.rate_limit_manager import RateLimit, rate_limit
+from managers.swagger_manager.doc_decorator import swagger
+from marshmallow import fields
+from setup import counter, docs
+
+NAME = 'profile'
+profile_blueprint = Blueprint(f'{NAME}_blueprint', url_prefix=f'/{NAME}', import_name=__name__)
+INVALID_IDENTITY = {'msg': 'Token identity is not a profile id'}, 401
+
+
+def current_profile_id():
+    try:
+        return int(get_jwt_identity())
+    except (TypeError, ValueError):
+        return None
+
+
+@swagger(
+    responses={
+        200: {
+            'description': 'Views, likes and fame of the profile',
+            'content': {
+                'id_profile': fields.Integer(),
+                'view_count': fields.Integer(),
+                'like_count': fields.Integer(),
+                'fame': fields.Integer(),
+            },
+        },
+        500: {'description': 'Stats could not be read', 'content': {'msg': fields.String()}},
+    },
+)
+@profile_blueprint.get('/<int:id_profile>/stats')
+@jwt_required()
+def get_profile_stats(id_profile):
+    stats = counter.get_stats(id_profile)
+    if stats is None:
+        return {'msg': 'Could not read the profile stats'}, 500
+    return stats, 200
+
+
+@swagger(
+    responses={
+        202: {'description': 'View recorded, it is counted at the next flush', 'content': {'msg': fields.String()}},
+        401: {'description': 'Token identity is not a profile id', 'content': {'msg': fields.String()}},
+    },
+)
+@profile_blueprint.post('/<int:id_profile>/view')
+@jwt_required()
+@rate_limit(per_user=RateLimit(capacity=60, period=60))
+def view_profile(id_profile):
+    id_viewer = current_profile_id()
+    if id_viewer is None:
+        return INVALID_IDENTITY
+    if id_viewer != id_profile:
+        counter.record_view(id_viewer, id_profile)
+    return {'msg': 'View recorded'}, 202
+
+
+@swagger(
+    responses={
+        202: {'description': 'Like recorded, it is counted at the next flush', 'content': {'msg': fields.String()}},
+        401: {'description': 'Token identity is not a profile id', 'content': {'msg': fields.String()}},
+        400: {'description': 'A profile cannot like itself', 'content': {'msg': fields.String()}},
+    },
+)
+@profile_blueprint.post('/<int:id_profile>/like')
+@jwt_required()
+@rate_limit(per_user=RateLimit(capacity=30, period=60))
+def like_profile(id_profile):
+    id_liker = current_profile_id()
+    if id_liker is None:
+        return INVALID_IDENTITY
+    if id_liker == id_profile:
+        return {'msg': 'A profile cannot like itself'}, 400
+    counter.record_like(id_liker, id_profile)
+    return {'msg': 'Like recorded'}, 202
+
+
+@swagger(
+    responses={
+        202: {'description': 'Unlike recorded, it is counted at the next flush', 'content': {'msg': fields.String()}},
+        401: {'description': 'Token identity is not a profile id', 'content': {'msg': fields.String()}},
+    },
+)
+@profile_blueprint.delete('/<int:id_profile>/like')
+@jwt_required()
+@rate_limit(per_user=RateLimit(capacity=30, period=60))
+def unlike_profile(id_profile):
+    id_liker = current_profile_id()
+    if id_liker is None:
+        return INVALID_IDENTITY
+    counter.record_like(id_liker, id_profile, liked=False)
+    return {'msg': 'Unlike recorded'}, 202
+
+
+docs.register_function(get_profile_stats, profile_blueprint)
+docs.register_function(view_profile, profile_blueprint)
+docs.register_function(like_profile, profile_blueprint)
+docs.register_function(unlike_profile, profile_blueprint)
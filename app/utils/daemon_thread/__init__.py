@@ -0,0 +1,3 @@
+from .daemon_thread import DaemonThread
+
+__all__ = ['DaemonThread']
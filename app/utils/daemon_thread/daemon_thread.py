@@ -0,0 +1,28 @@
+import threading
+from collections.abc import Callable
+
+
+class DaemonThread:
+    """Daemon thread started on demand and restarted when it is not running.
+
+    Threads do not survive a fork: calling ensure_running() on the first request or event of each
+    worker restarts the thread that was started in the parent process.
+    """
+
+    def __init__(self, target: Callable[[], None], name: str):
+        self.target = target
+        self.name = name
+        self.thread: threading.Thread | None = None
+        self.lock = threading.Lock()
+
+    def is_alive(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def ensure_running(self):
+        if self.is_alive():
+            return
+        with self.lock:
+            if self.is_alive():
+                return
+            self.thread = threading.Thread(target=self.target, name=self.name, daemon=True)
+            self.thread.start()
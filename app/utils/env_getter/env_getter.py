@@ -1,6 +1,6 @@
 import os
 
-from .errors import SeveralEnvironmentVariablesNotFoundError, WrongBooleanValueError
+from .errors import NonPositiveIntegerError, SeveralEnvironmentVariablesNotFoundError, WrongBooleanValueError, WrongIntegerValueError
 from .types import EnvironmentVariableSpec
 
 
@@ -35,6 +35,23 @@ class EnvironmentGetter:
         else:
             raise WrongBooleanValueError(variable_name, value)
 
+    def get_int(self, variable_name, description=None, *, required=True, default=None):
+        value = self.get_string(variable_name, description=description, required=required)
+
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except ValueError as e:
+            raise WrongIntegerValueError(variable_name, value) from e
+
+    def get_positive_int(self, variable_name, description=None, *, required=True, default=None):
+        value = self.get_int(variable_name, description=description, required=required, default=default)
+
+        if value is not None and value < 1:
+            raise NonPositiveIntegerError(variable_name, value)
+        return value
+
     def fail_if_missing(self):
         error_variables = [variable for i, variable in enumerate(self.variables) if variable['required'] and (variable['value'] is None)]
         if len(error_variables) == 0:
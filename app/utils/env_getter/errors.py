@@ -20,3 +20,15 @@ class WrongBooleanValueError(Exception):
     def __init__(self, variable_name: str, value: str):
         message = f'Wrong value for the boolean variable {variable_name}: {value}'
         super().__init__(message)
+
+
+class WrongIntegerValueError(Exception):
+    def __init__(self, variable_name: str, value: str):
+        message = f'Wrong value for the integer variable {variable_name}: {value}'
+        super().__init__(message)
+
+
+class NonPositiveIntegerError(Exception):
+    def __init__(self, variable_name: str, value: int):
+        message = f'The integer variable {variable_name} must be at least 1: {value}'
+        super().__init__(message)
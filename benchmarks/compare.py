@@ -0,0 +1,98 @@
+"""Compare two benchmark result files.
+
+usage: python benchmarks/compare.py baseline.json current.json [--threshold 0.1]
+"""
+
+import argparse
+import json
+import sys
+
+# Memory deltas of a few hundred kb are allocator noise, a growth below this never counts as a regression
+MEMORY_SLACK_KB = 1024
+
+
+def load_results(path: str) -> dict[tuple[str, int], dict]:
+    with open(path) as file:
+        data = json.load(file)
+    return {(result['name'], result['concurrency']): result for result in data['results']}
+
+
+def memory_growth_kb(reference: dict, result: dict, threshold: float) -> tuple[int | None, bool]:
+    """Compare the python heap peak when both runs traced it, the rss delta otherwise"""
+    for metric in ('python_peak_kb', 'rss_delta_kb'):
+        if reference.get(metric) is not None and result.get(metric) is not None:
+            growth = result[metric] - reference[metric]
+            return growth, growth > max(threshold * abs(reference[metric]), MEMORY_SLACK_KB)
+    return None, False
+
+
+def error_rate(result: dict) -> float:
+    return result['errors'] / result['requests'] if result['requests'] else 0.0
+
+
+def compare(baseline: dict[tuple[str, int], dict], current: dict[tuple[str, int], dict], threshold: float) -> list[dict]:
+    """A scenario regresses when its throughput drops, or its p95 latency or memory grows, by more than `threshold`.
+
+    Any increase of the error rate is a regression too, a call failing fast would otherwise look like a speedup.
+    A scenario missing from one of the files is flagged, the baseline has to be refreshed.
+    """
+    rows = []
+    for key in sorted(baseline.keys() | current.keys()):
+        reference, result = baseline.get(key), current.get(key)
+        if reference is None or result is None:
+            rows.append(
+                {'name': key[0], 'concurrency': key[1], 'missing_from': 'baseline' if reference is None else 'current', 'regression': True}
+            )
+            continue
+        throughput_change = (result['throughput'] - reference['throughput']) / reference['throughput'] if reference['throughput'] else 0.0
+        p95_change = (result['p95_ms'] - reference['p95_ms']) / reference['p95_ms'] if reference['p95_ms'] else 0.0
+        memory_growth, memory_regression = memory_growth_kb(reference, result, threshold)
+        rows.append(
+            {
+                'name': key[0],
+                'concurrency': key[1],
+                'missing_from': None,
+                'throughput_change': throughput_change,
+                'p95_change': p95_change,
+                'memory_growth_kb': memory_growth,
+                'baseline_error_rate': error_rate(reference),
+                'error_rate': error_rate(result),
+                'regression': (
+                    throughput_change < -threshold
+                    or p95_change > threshold
+                    or memory_regression
+                    or error_rate(result) > error_rate(reference)
+                ),
+            }
+        )
+    return rows
+
+
+def print_comparison(rows: list[dict]):
+    print(f"{'scenario':<32} {'conc':>5} {'throughput':>11} {'p95':>9} {'memory kb':>10} {'errors':>8}")
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        if row['missing_from']:
+            print(f"{row['name']:<32} {row['concurrency']:>5} missing from the {row['missing_from']} results{flag}")
+            continue
+        memory = 'n/a' if row['memory_growth_kb'] is None else f"{row['memory_growth_kb']:+d}"
+        print(
+            f"{row['name']:<32} {row['concurrency']:>5} {row['throughput_change']:>+10.1%} {row['p95_change']:>+8.1%} "
+            f"{memory:>10} {row['error_rate']:>8.1%}{flag}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.1, help='Allowed relative change before flagging a regression')
+    args = parser.parse_args()
+
+    rows = compare(load_results(args.baseline), load_results(args.current), args.threshold)
+    print_comparison(rows)
+    sys.exit(1 if any(row['regression'] for row in rows) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+import resource
+import statistics
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+
+# A scenario builds one operation per thread (e.g. to give each thread its own http session),
+# the operation returns False when the call failed
+OperationFactory = Callable[[], Callable[[], bool]]
+WARMUP = 10
+BARRIER_TIMEOUT = 60
+
+
+@dataclass
+class Scenario:
+    name: str
+    kind: str
+    factory: OperationFactory
+    # Returns the number of operations that failed silently during the last run (e.g. create_one swallows errors)
+    check: Callable[[], int] | None = None
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    kind: str
+    concurrency: int
+    requests: int
+    errors: int
+    first_error: str | None
+    duration_s: float
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    # Resident memory gained by the process during this run, it includes the client threads of http scenarios
+    rss_delta_kb: int | None
+    python_peak_kb: int | None
+
+    def dump(self):
+        return asdict(self)
+
+
+def current_rss_kb() -> int | None:
+    # ru_maxrss is a high-water mark of the whole process, only the current resident size gives a per run delta
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize() // 1024
+    except OSError:
+        return None
+
+
+def percentiles(latencies: list[float]) -> tuple[float, float, float]:
+    if not latencies:
+        return 0.0, 0.0, 0.0
+    if len(latencies) == 1:
+        return latencies[0], latencies[0], latencies[0]
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return cuts[49], cuts[94], cuts[98]
+
+
+def run_concurrent(scenario: Scenario, total: int, concurrency: int, *, trace_memory: bool = False) -> BenchmarkResult:
+    shares = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+    latencies: list[list[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    first_errors: list[str] = []
+    start_barrier = threading.Barrier(concurrency + 1)
+
+    def call(operation) -> bool:
+        # requests raises on timeouts and refused connections instead of returning a failed response
+        try:
+            return bool(operation())
+        except Exception as e:
+            if not first_errors:
+                first_errors.append(repr(e))
+            return False
+
+    def worker(index: int):
+        try:
+            operation = scenario.factory()
+            for _ in range(min(WARMUP, shares[index])):
+                call(operation)
+        except Exception as e:
+            first_errors.append(repr(e))
+            start_barrier.abort()
+            return
+        try:
+            start_barrier.wait(timeout=BARRIER_TIMEOUT)
+        except threading.BrokenBarrierError:
+            return
+        local = latencies[index]
+        for _ in range(shares[index]):
+            begin = time.perf_counter()
+            ok = call(operation)
+            local.append(time.perf_counter() - begin)
+            if not ok:
+                errors[index] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+
+    rss_before = current_rss_kb()
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        start_barrier.wait(timeout=BARRIER_TIMEOUT)
+    except threading.BrokenBarrierError as e:
+        if trace_memory:
+            tracemalloc.stop()
+        reason = first_errors[0] if first_errors else f'workers not ready after {BARRIER_TIMEOUT}s'
+        raise RuntimeError(f'{scenario.name}: could not start the timed run ({reason})') from e
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - begin
+    python_peak_kb = None
+    if trace_memory:
+        python_peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    rss_after = current_rss_kb()
+
+    all_latencies = sorted(latency * 1000 for local in latencies for latency in local)
+    p50, p95, p99 = percentiles(all_latencies)
+    return BenchmarkResult(
+        name=scenario.name,
+        kind=scenario.kind,
+        concurrency=concurrency,
+        requests=len(all_latencies),
+        errors=sum(errors),
+        first_error=first_errors[0] if first_errors else None,
+        duration_s=round(duration, 4),
+        throughput=round(len(all_latencies) / duration, 2) if duration else 0.0,
+        p50_ms=round(p50, 3),
+        p95_ms=round(p95, 3),
+        p99_ms=round(p99, 3),
+        rss_delta_kb=None if rss_before is None or rss_after is None else rss_after - rss_before,
+        python_peak_kb=python_peak_kb,
+    )
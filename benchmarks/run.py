@@ -0,0 +1,160 @@
+"""Throughput, latency and memory benchmarks for the API and the ORM layer.
+
+The app is built with create_app() against the database of the .env (ENV=test by default),
+synthetic profiles are seeded through ModelInterface and every scenario is run once per
+concurrency level. create_app() resets the public schema, so any ENV other than test
+requires --force.
+
+The http server runs in a thread of the benchmark process: client threads and the server share
+the GIL and the memory figures, so http numbers are comparable between runs of this suite but
+lower than what a uwsgi deployment serves.
+
+usage: python benchmarks/run.py [--concurrency 1,4,16] [--output results.json] [--baseline baseline.json]
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+
+from compare import compare, load_results, print_comparison
+from measure import BenchmarkResult, Scenario, run_concurrent
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT_DIR, 'app')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the matcha API and ORM layer')
+    parser.add_argument('--requests', type=int, default=2000, help='Calls per scenario and concurrency level')
+    parser.add_argument(
+        '--concurrency',
+        type=lambda levels: [int(level) for level in levels.split(',')],
+        default=[1, 4, 16],
+        help='Comma separated concurrency levels of the sweep',
+    )
+    parser.add_argument('--profiles', type=int, default=1000, help='Number of synthetic profiles to seed')
+    parser.add_argument('--only', choices=['http', 'orm'], help='Run a single family of scenarios')
+    parser.add_argument('--output', default=os.path.join(ROOT_DIR, 'benchmarks', 'results', 'latest.json'))
+    parser.add_argument('--baseline', help='Result file to compare against, exits with 1 on regression')
+    parser.add_argument('--threshold', type=float, default=0.1, help='Allowed relative change before flagging a regression')
+    parser.add_argument('--trace-memory', action='store_true', help='Also report the python heap peak (slows the scenarios down)')
+    parser.add_argument('--with-rate-limit', action='store_true', help='Keep the rate limiter enabled')
+    parser.add_argument('--keep-logs', action='store_true', help='Keep the debug logs of the database connection')
+    parser.add_argument('--force', action='store_true', help='Allow running against a non test database')
+    return parser.parse_args()
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scenarios(scenarios: list[Scenario], args) -> list[BenchmarkResult]:
+    results = []
+    print(
+        f"{'scenario':<32} {'conc':>5} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'rss +kb':>9}",
+        file=sys.stderr,
+    )
+    for scenario in scenarios:
+        total = args.requests // 10 if scenario.name == 'orm.get_all' else args.requests
+        for concurrency in args.concurrency:
+            result = run_concurrent(scenario, total, concurrency, trace_memory=args.trace_memory)
+            if scenario.check is not None:
+                result.errors += scenario.check()
+            results.append(result)
+            print(
+                f'{scenario.name:<32} {concurrency:>5} {result.throughput:>10.1f} {result.p50_ms:>9.2f} {result.p95_ms:>9.2f} '
+                f"{result.p99_ms:>9.2f} {result.errors:>7} {'n/a' if result.rss_delta_kb is None else result.rss_delta_kb:>9}",
+                file=sys.stderr,
+            )
+            if result.first_error:
+                print(f'    first error: {result.first_error}', file=sys.stderr)
+    return results
+
+
+def write_results(results: list[BenchmarkResult], args):
+    output = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'requests': args.requests,
+            'profiles': args.profiles,
+            'concurrency': args.concurrency,
+            'rate_limit': args.with_rate_limit,
+            'client_in_server_process': True,
+        },
+        'results': [result.dump() for result in results],
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as file:
+        json.dump(output, file, indent=2)
+    print(f'Results written to {args.output}', file=sys.stderr)
+
+
+def main():
+    args = parse_args()
+
+    sys.path.insert(0, APP_DIR)
+    os.environ.setdefault('ENV', 'test')
+    from config import config
+
+    if config.ENV != 'test' and not args.force:
+        sys.exit(f'Refusing to reset the {config.ENV} database {config.DB_NAME}, use ENV=test or --force')
+
+    from flask_jwt_extended import create_access_token
+    from managers.database_manager.model_interface import ModelInterface
+    from scenarios import count_profiles, create_bench_blueprint, define_profile_model, endpoint_scenarios, orm_scenarios, seed_profiles
+    from setup import create_app, db, limiter
+    from werkzeug.serving import make_server
+
+    profile_model = define_profile_model(db, ModelInterface)
+    app = create_app()
+    app.register_blueprint(create_bench_blueprint(profile_model))
+    limiter.enabled = args.with_rate_limit
+    if not args.keep_logs:
+        for name in ('database_connection', 'werkzeug'):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with app.app_context():
+        # Profile events need an integer identity, 0 is never a seeded profile
+        token = create_access_token('0')
+
+    scenarios = []
+    if args.only in (None, 'http'):
+        scenarios += endpoint_scenarios(f'http://127.0.0.1:{server.server_port}', token, args.profiles)
+    if args.only in (None, 'orm'):
+        scenarios += orm_scenarios(db, profile_model, args.profiles)
+
+    # The ORM prints the queries and the rows it fetches, keep stdout out of the measures
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        begin = time.perf_counter()
+        seed_profiles(profile_model, args.profiles)
+        seeded = count_profiles(db, profile_model)
+        if seeded != args.profiles:
+            sys.exit(f'Seeding failed: {seeded} of {args.profiles} profiles were inserted')
+        print(f'Seeded {args.profiles} profiles in {time.perf_counter() - begin:.2f}s', file=sys.stderr)
+        results = run_scenarios(scenarios, args)
+    server.shutdown()
+
+    write_results(results, args)
+    if args.baseline:
+        rows = compare(load_results(args.baseline), load_results(args.output), args.threshold)
+        print_comparison(rows)
+        if any(row['regression'] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+import itertools
+import random
+import threading
+
+import requests
+from flask import Blueprint
+from flask_jwt_extended import jwt_required
+from measure import OperationFactory, Scenario
+
+
+def define_profile_model(db, model_interface):
+    """Declared before create_app() so that db.create_table() creates it with the other models"""
+
+    class BenchProfileModel(model_interface):
+        id_profile = db.int(primary_key=True)
+        username = db.string(64)
+        age = db.int()
+        fame = db.int()
+
+    return BenchProfileModel
+
+
+def seed_profiles(profile_model, count: int, first_id: int = 1):
+    rng = random.Random(first_id)
+    for id_profile in range(first_id, first_id + count):
+        profile_model.load(
+            {'id_profile': id_profile, 'username': f'bench_user_{id_profile}', 'age': rng.randint(18, 99), 'fame': rng.randint(0, 1000)}
+        ).create_one()
+
+
+def count_profiles(db, profile_model, above: int = 0) -> int:
+    name = profile_model.__name__.replace('Model', '').lower()
+    with db.database.cursor() as cur:
+        cur.execute(f'SELECT count(*) FROM public.{name} WHERE id_profile > %s', (above,))
+        count = cur.fetchone()[0]
+        db.database.commit()
+    return count
+
+
+def create_bench_blueprint(profile_model):
+    bench_blueprint = Blueprint('bench_blueprint', url_prefix='/bench', import_name=__name__)
+
+    @bench_blueprint.get('/profile/<int:id_profile>')
+    @jwt_required()
+    def get_bench_profile(id_profile):
+        profile = profile_model().get_one(id_profile)
+        if profile is None:
+            return {'msg': 'Profile not found'}, 404
+        return profile.dump(), 200
+
+    return bench_blueprint
+
+
+def endpoint_scenarios(base_url: str, token: str, profiles: int) -> list[Scenario]:
+    def get(path: str, headers: dict = None) -> OperationFactory:
+        def factory():
+            session = requests.Session()
+            return lambda: session.get(f'{base_url}{path}', headers=headers, timeout=10).ok
+
+        return factory
+
+    def get_profile() -> OperationFactory:
+        headers = {'Authorization': f'Bearer {token}'}
+
+        def factory():
+            session = requests.Session()
+            rng = random.Random()
+            return lambda: session.get(f'{base_url}/bench/profile/{rng.randint(1, profiles)}', headers=headers, timeout=10).ok
+
+        return factory
+
+    def profile_event(kind: str) -> OperationFactory:
+        headers = {'Authorization': f'Bearer {token}'}
+
+        def factory():
+            session = requests.Session()
+            rng = random.Random()
+            return lambda: session.post(f'{base_url}/profile/{rng.randint(1, profiles)}/{kind}', headers=headers, timeout=10).ok
+
+        return factory
+
+    return [
+        Scenario('http.health_check', 'http', get('/')),
+        Scenario('http.rate_limit_stats', 'http', get('/rate-limit')),
+        Scenario('http.profile_jwt_get_one', 'http', get_profile()),
+        Scenario('http.profile_stats', 'http', get(f'/profile/{profiles}/stats', {'Authorization': f'Bearer {token}'})),
+        Scenario('http.profile_view', 'http', profile_event('view')),
+    ]
+
+
+def orm_scenarios(db, profile_model, profiles: int) -> list[Scenario]:
+    new_ids = itertools.count(profiles + 1)
+    issued = {'ids': 0, 'failed': 0}
+    issued_lock = threading.Lock()
+
+    def get_one() -> OperationFactory:
+        def factory():
+            rng = random.Random()
+            return lambda: profile_model().get_one(rng.randint(1, profiles)) is not None
+
+        return factory
+
+    def get_all() -> OperationFactory:
+        return lambda: lambda: len(profile_model().get_all()) > 0
+
+    def create_one() -> OperationFactory:
+        def operation():
+            with issued_lock:
+                id_profile = next(new_ids)
+                issued['ids'] += 1
+            profile_model.load({'id_profile': id_profile, 'username': f'bench_user_{id_profile}', 'age': 30, 'fame': 0}).create_one()
+            return True
+
+        return lambda: operation
+
+    def check_inserted() -> int:
+        # create_one swallows its errors, missing rows are the only trace of a failed insert
+        failed = issued['ids'] - count_profiles(db, profile_model, above=profiles)
+        new_failures, issued['failed'] = failed - issued['failed'], failed
+        return new_failures
+
+    # create_one runs last so that every get_all sweep reads the same number of rows
+    return [
+        Scenario('orm.get_one', 'orm', get_one()),
+        Scenario('orm.get_all', 'orm', get_all()),
+        Scenario('orm.create_one', 'orm', create_one(), check_inserted),
+    ]
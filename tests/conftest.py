@@ -0,0 +1,51 @@
+import os
+from types import SimpleNamespace
+
+import psycopg2
+import pytest
+from flask import Flask
+
+# config is loaded on import, these defaults match the test database of envs/dev/docker-compose.yml
+os.environ.setdefault('ENV', 'test')
+os.environ.setdefault('JWT_SECRET', 'test-secret-long-enough-for-hs256-signatures')
+os.environ.setdefault('DB_USER', 'postgres')
+os.environ.setdefault('DB_PASS', 'postgres')
+os.environ.setdefault('DB_NAME', 'db_test')
+os.environ.setdefault('DB_IP', 'localhost')
+os.environ.setdefault('DB_PORT', '5432')
+
+from managers.jwt_manager import CachedJWTManager  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = os.environ['JWT_SECRET']
+    app.config['JWT_VERIFICATION_CACHE_SIZE'] = 16
+    return app
+
+
+@pytest.fixture
+def jwt(app):
+    return CachedJWTManager(app)
+
+
+@pytest.fixture
+def database_connection():
+    """Stands for DatabaseConnection on the test database, skips the test when it is not reachable"""
+    from config import config
+
+    connection_params = {
+        'host': config.DB_IP,
+        'port': config.DB_PORT,
+        'user': config.DB_USER,
+        'password': config.DB_PASS,
+        'database': config.DB_NAME,
+    }
+    try:
+        database = psycopg2.connect(**connection_params, connect_timeout=2)
+    except psycopg2.OperationalError:
+        pytest.skip('test database is not reachable')
+
+    yield SimpleNamespace(database=database, get_connection_params=lambda: connection_params)
+    database.close()
@@ -0,0 +1,26 @@
+import threading
+
+from utils.daemon_thread import DaemonThread
+
+
+def test_ensure_running_starts_one_thread_and_restarts_it_once_stopped():
+    started = []
+    release = threading.Event()
+
+    def target():
+        started.append(threading.current_thread())
+        release.wait(5)
+
+    daemon = DaemonThread(target, 'test-daemon')
+    daemon.ensure_running()
+    daemon.ensure_running()
+    assert daemon.is_alive()
+    assert daemon.thread.daemon
+
+    release.set()
+    daemon.thread.join(5)
+    assert not daemon.is_alive()
+
+    daemon.ensure_running()
+    daemon.thread.join(5)
+    assert len(started) == 2
@@ -0,0 +1,118 @@
+import threading
+from types import SimpleNamespace
+
+import psycopg2
+import pytest
+from managers.counter_manager import EventCounter, event_counter
+
+CONFIG = SimpleNamespace(FAME_FLUSH_INTERVAL=3600, FAME_MAX_BUFFERED=1000, FAME_VIEW_WEIGHT=1, FAME_LIKE_WEIGHT=10)
+
+
+@pytest.fixture
+def counter():
+    counter = EventCounter()
+    counter.max_buffered = 3
+    # An alive thread stands for the flusher so that the tests drive flush() themselves
+    counter.flusher.thread = threading.current_thread()
+    return counter
+
+
+def test_reserve_wakes_the_flusher_then_drops(counter):
+    counter.connection_params = {}
+    counter.record_view(1, 2)
+    counter.record_view(1, 2)
+    assert not counter.wake_up.is_set()
+
+    counter.record_view(1, 3)
+    assert counter.wake_up.is_set()
+
+    for _ in range(5):
+        counter.record_view(4, 2)
+    assert counter.get_counters() == {'pending': 6, 'flushed': 0, 'dropped': 2}
+    assert counter.views == {(1, 2): 2, (1, 3): 1, (4, 2): 3}
+
+
+def test_last_like_state_wins_within_a_buffer(counter):
+    counter.record_like(1, 2)
+    counter.record_like(1, 2, liked=False)
+    counter.record_like(3, 2, liked=False)
+    counter.record_like(3, 2)
+    assert counter.likes == {(1, 2): False, (3, 2): True}
+
+
+def test_failed_flush_requeues_without_overriding_newer_events(counter, monkeypatch):
+    counter.connection_params = {}
+    counter.record_view(1, 2)
+    counter.record_like(1, 2)
+    counter.record_like(5, 6)
+
+    def connect_and_fail(**params):
+        # Events recorded while the flush is running are newer than the batch being written
+        counter.record_view(1, 2)
+        counter.record_like(1, 2, liked=False)
+        raise psycopg2.OperationalError('database down')
+
+    monkeypatch.setattr(event_counter.psycopg2, 'connect', connect_and_fail)
+    counter.flush()
+
+    assert counter.views == {(1, 2): 2}
+    assert counter.likes == {(1, 2): False, (5, 6): True}
+    assert counter.get_counters() == {'pending': 5, 'flushed': 0, 'dropped': 0}
+
+
+def test_flush_without_events_does_not_connect(counter, monkeypatch):
+    monkeypatch.setattr(event_counter.psycopg2, 'connect', lambda **params: pytest.fail('flush connected without events'))
+    counter.flush()
+
+
+@pytest.fixture
+def database_counter(database_connection):
+    with database_connection.database.cursor() as cur:
+        cur.execute('DROP TABLE IF EXISTS public.profile_view, public.profile_like, public.profile_stats')
+        database_connection.database.commit()
+
+    counter = EventCounter()
+    counter.flusher.thread = threading.current_thread()
+    counter.init_app(database_connection, CONFIG)
+    return counter
+
+
+def test_write_counts_views_likes_and_fame(database_counter):
+    database_counter.record_view(1, 2)
+    database_counter.record_view(1, 2)
+    database_counter.record_view(3, 2)
+    database_counter.record_like(1, 2)
+    database_counter.flush()
+
+    assert database_counter.get_stats(2) == {'id_profile': 2, 'view_count': 2, 'like_count': 1, 'fame': 2 * 1 + 1 * 10}
+    assert database_counter.get_counters()['flushed'] == 4
+
+
+def test_repeated_views_count_one_viewer(database_counter):
+    for _ in range(3):
+        database_counter.record_view(1, 2)
+        database_counter.flush()
+
+    assert database_counter.get_stats(2) == {'id_profile': 2, 'view_count': 1, 'like_count': 0, 'fame': 1}
+    with database_counter.database.cursor() as cur:
+        cur.execute('SELECT view_count FROM public.profile_view WHERE id_viewer = 1 AND id_viewed = 2')
+        assert cur.fetchone() == (3,)
+        database_counter.database.commit()
+
+
+def test_liking_twice_counts_once_and_unlike_removes_it(database_counter):
+    database_counter.record_like(1, 2)
+    database_counter.flush()
+    database_counter.record_like(1, 2)
+    database_counter.record_like(3, 2)
+    database_counter.flush()
+    assert database_counter.get_stats(2)['like_count'] == 2
+
+    database_counter.record_like(1, 2, liked=False)
+    database_counter.record_like(4, 2, liked=False)
+    database_counter.flush()
+    assert database_counter.get_stats(2) == {'id_profile': 2, 'view_count': 0, 'like_count': 1, 'fame': 10}
+
+
+def test_unknown_profile_has_empty_stats(database_counter):
+    assert database_counter.get_stats(42) == {'id_profile': 42, 'view_count': 0, 'like_count': 0, 'fame': 0}
@@ -0,0 +1,227 @@
+import select
+import threading
+import time
+from contextlib import closing
+from datetime import timedelta
+
+import psycopg2
+import pytest
+from flask_jwt_extended import create_access_token, get_jwt, jwt_required
+from managers.jwt_manager import revocation_index, verification_cache
+from managers.jwt_manager.revocation_index import RevocationIndex
+from managers.jwt_manager.verification_cache import VerificationCache
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+
+def test_cache_evicts_least_recently_used():
+    cache = VerificationCache(max_size=2)
+    cache.put('a', {'jti': 'a'})
+    cache.put('b', {'jti': 'b'})
+    assert cache.get('a') == {'jti': 'a'}
+
+    cache.put('c', {'jti': 'c'})
+    assert cache.get('b') is None
+    assert cache.get('a') == {'jti': 'a'}
+    assert cache.get('c') == {'jti': 'c'}
+
+
+def test_cache_drops_expired_tokens(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(verification_cache.time, 'time', lambda: now[0])
+    cache = VerificationCache()
+    cache.put('token', {'jti': 'a', 'exp': 1010})
+
+    assert cache.get('token') is not None
+    now[0] = 1010
+    assert cache.get('token') is None
+    assert cache.get_stats()['size'] == 0
+
+
+def test_cache_returns_copies():
+    cache = VerificationCache()
+    cache.put('token', {'jti': 'a'})
+    cache.get('token')['jti'] = 'changed'
+    assert cache.get('token') == {'jti': 'a'}
+
+
+@pytest.fixture(autouse=True)
+def protected_route(app, jwt):
+    @app.get('/protected')
+    @jwt_required()
+    def protected():
+        return {'jti': get_jwt()['jti']}, 200
+
+
+def test_verified_tokens_are_served_from_cache(app, jwt):
+    client = app.test_client()
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token("1")}'}
+
+    assert client.get('/protected', headers=headers).status_code == 200
+    assert client.get('/protected', headers=headers).status_code == 200
+    assert jwt.verification_cache.get_stats()['hits'] == 1
+
+
+def test_cached_token_is_still_checked_for_revocation(app, jwt):
+    client = app.test_client()
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token("1")}'}
+
+    jti = client.get('/protected', headers=headers).json['jti']
+    jwt.revocations.revoked[jti] = float('inf')
+
+    response = client.get('/protected', headers=headers)
+    assert response.status_code == 401
+    assert jwt.verification_cache.get_stats()['hits'] == 1
+
+
+def test_invalid_tokens_are_not_cached(app, jwt):
+    client = app.test_client()
+    with app.app_context():
+        token = create_access_token('1')
+        expired = create_access_token('1', expires_delta=timedelta(seconds=-1))
+
+    assert client.get('/protected', headers={'Authorization': f'Bearer {token[:-2]}xx'}).status_code == 422
+    assert client.get('/protected', headers={'Authorization': f'Bearer {expired}'}).status_code == 401
+    assert jwt.verification_cache.get_stats()['size'] == 0
+
+
+class FakeNotify:
+    def __init__(self, payload):
+        self.payload = payload
+
+
+class FakeListenConnection:
+    def __init__(self):
+        self.notifies = []
+        self.closed = False
+
+    def set_isolation_level(self, level):
+        pass
+
+    def cursor(self):
+        connection = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                return False
+
+            def execute(self, query, params=None):
+                connection.listening = True
+
+        return Cursor()
+
+    def poll(self):
+        self.notifies.append(FakeNotify('9999999999:revoked-jti'))
+
+    def close(self):
+        self.closed = True
+
+
+def test_listener_syncs_while_notifications_keep_arriving(monkeypatch):
+    index = RevocationIndex()
+    index.connection_params = {}
+    index.sync_interval = 2
+    connection = FakeListenConnection()
+    now = [0.0]
+    syncs = []
+    polls = []
+
+    def fake_select(readers, writers, errors, timeout):
+        # a notification is always ready, select never times out
+        now[0] += 0.5
+        polls.append(timeout)
+        if len(polls) >= 20:
+            index.stopped.set()
+        return readers, [], []
+
+    monkeypatch.setattr(revocation_index.psycopg2, 'connect', lambda **params: connection)
+    monkeypatch.setattr(revocation_index.select, 'select', fake_select)
+    monkeypatch.setattr(revocation_index.time, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(index, '_sync', lambda conn: syncs.append(now[0]))
+
+    index._listen()
+
+    assert index.is_revoked('revoked-jti') is True
+    # one sync on connect then one every 2 seconds of the 10 simulated seconds
+    assert syncs == [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+    assert connection.closed
+
+
+@pytest.fixture
+def revocation_indexes(database_connection):
+    with database_connection.database.cursor() as cur:
+        cur.execute('DROP TABLE IF EXISTS public.revoked_token')
+        database_connection.database.commit()
+
+    indexes = []
+    for _ in range(2):
+        index = RevocationIndex()
+        # An alive thread stands for the listener so that the tests drive _sync() themselves
+        index.listener.thread = threading.current_thread()
+        index.init_app(database_connection)
+        indexes.append(index)
+    return indexes
+
+
+def test_revocation_reaches_another_index_through_delta_sync(revocation_indexes):
+    writer, reader = revocation_indexes
+    expires_at = time.time() + 3600
+
+    writer.revoke('first', expires_at)
+    reader._sync(reader.database)
+    assert reader.is_revoked('first')
+    assert reader.last_revoked_at is not None
+
+    writer.revoke('second', expires_at)
+    reader._sync(reader.database)
+    assert reader.is_revoked('second')
+    assert writer.is_revoked('second')
+
+
+def test_delta_sync_looks_back_for_late_commits(revocation_indexes):
+    writer, reader = revocation_indexes
+    writer.revoke('first', time.time() + 3600)
+    reader._sync(reader.database)
+
+    # committed after the last sync but stamped before it
+    with writer.database.cursor() as cur:
+        cur.execute(
+            "INSERT INTO public.revoked_token (jti, expires_at, revoked_at) VALUES (%s, %s, %s - INTERVAL '30 seconds')",
+            ('late', time.time() + 3600, reader.last_revoked_at),
+        )
+        writer.database.commit()
+    reader._sync(reader.database)
+    assert reader.is_revoked('late')
+
+
+def test_sync_purges_expired_revocations(revocation_indexes):
+    writer, reader = revocation_indexes
+    writer.revoke('expired', time.time() - 10)
+    writer.revoke('valid', time.time() + 3600)
+    reader.revoked['expired_in_memory'] = time.time() - 10
+
+    reader._sync(reader.database)
+    assert not reader.is_revoked('expired')
+    assert not reader.is_revoked('expired_in_memory')
+    assert reader.is_revoked('valid')
+    with reader.database.cursor() as cur:
+        cur.execute('SELECT jti FROM public.revoked_token')
+        assert cur.fetchall() == [('valid',)]
+        reader.database.commit()
+
+
+def test_revoke_notifies_listeners(revocation_indexes, database_connection):
+    writer, _ = revocation_indexes
+    with closing(psycopg2.connect(**database_connection.get_connection_params())) as listener:
+        listener.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with listener.cursor() as cur:
+            cur.execute(f'LISTEN {RevocationIndex.CHANNEL}')
+
+        writer.revoke('notified', 4102444800.0)
+        assert select.select([listener], [], [], 5) != ([], [], [])
+        listener.poll()
+        assert [notify.payload for notify in listener.notifies] == ['4102444800.0:notified']
@@ -0,0 +1,169 @@
+from types import SimpleNamespace
+
+import pytest
+from flask import Blueprint, request
+from flask_jwt_extended import create_access_token
+from managers.rate_limit_manager import RateLimit, RateLimiter, backends, rate_limit
+from managers.rate_limit_manager.backends import BucketBackend, MemoryBackend
+from managers.rate_limit_manager.token_bucket import consume, refill
+
+CONFIG = SimpleNamespace(RATE_LIMIT_ENABLED=True, RATE_LIMIT_BACKEND='memory', RATE_LIMIT_REDIS_URL=None)
+
+
+class FailingBackend(BucketBackend):
+    def hit(self, key, limit):
+        raise ConnectionError('backend down')
+
+
+def test_rate_limit_rejects_invalid_values():
+    with pytest.raises(ValueError):
+        RateLimit(capacity=5, period=0)
+    with pytest.raises(ValueError):
+        RateLimit(capacity=0, period=60)
+
+
+def test_refill_is_capped_by_capacity():
+    limit = RateLimit(capacity=10, period=10)
+    assert refill(0, 3, limit) == 3
+    assert refill(8, 5, limit) == 10
+    assert refill(4, -1, limit) == 4
+
+
+def test_consume_and_retry_after():
+    limit = RateLimit(capacity=4, period=2)
+    assert consume(1.5, limit).allowed
+    assert consume(1.5, limit).tokens == 0.5
+
+    state = consume(0.5, limit)
+    assert not state.allowed
+    assert state.tokens == 0.5
+    assert state.retry_after == pytest.approx(0.25)
+
+
+def test_memory_backend_refills_over_time(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(backends.time, 'monotonic', lambda: now[0])
+    backend = MemoryBackend()
+    limit = RateLimit(capacity=2, period=2)
+
+    assert [backend.hit('key', limit).allowed for _ in range(3)] == [True, True, False]
+    now[0] += 1
+    assert backend.hit('key', limit).allowed
+
+
+def test_memory_backend_sweeps_idle_buckets(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(backends.time, 'monotonic', lambda: now[0])
+    backend = MemoryBackend()
+    backend.SWEEP_EVERY = 2
+    limit = RateLimit(capacity=5, period=10)
+
+    backend.hit('idle', limit)
+    now[0] += 11
+    backend.hit('active', limit)
+    assert set(backend.buckets) == {'active'}
+
+
+@pytest.fixture
+def limiter(app, jwt):
+    limiter = RateLimiter()
+
+    limited_blueprint = Blueprint('limited_blueprint', __name__)
+
+    @limited_blueprint.get('/decorated')
+    @rate_limit(per_ip=RateLimit(capacity=1, period=60))
+    def decorated():
+        return {'msg': 'ok'}, 200
+
+    @limited_blueprint.get('/shared_a')
+    def shared_a():
+        return {'msg': 'ok'}, 200
+
+    @limited_blueprint.get('/shared_b')
+    def shared_b():
+        return {'msg': 'ok'}, 200
+
+    @limited_blueprint.post('/login')
+    @rate_limit(per_user=RateLimit(capacity=1, period=60), user_key=lambda: request.get_json()['username'])
+    def login():
+        return {'msg': 'ok'}, 200
+
+    @limited_blueprint.get('/me')
+    @rate_limit(per_user=RateLimit(capacity=1, period=60))
+    def me():
+        return {'msg': 'ok'}, 200
+
+    app.register_blueprint(limited_blueprint)
+    limiter.limit_blueprint(limited_blueprint, per_ip=RateLimit(capacity=2, period=60))
+    limiter.init_app(app, CONFIG)
+    return limiter
+
+
+def test_decorator_rejects_with_retry_after(app, limiter):
+    client = app.test_client()
+
+    assert client.get('/decorated').status_code == 200
+    response = client.get('/decorated')
+    assert response.status_code == 429
+    assert response.json == {'msg': 'Too many requests'}
+    assert int(response.headers['Retry-After']) == 60
+    assert limiter.get_stats()['rejected_by_endpoint'] == {'limited_blueprint.decorated': {'ip': 1, 'user': 0}}
+
+
+def test_decorator_takes_precedence_over_blueprint(app, limiter):
+    client = app.test_client()
+
+    # the decorated view has its own bucket of 1, the others share the blueprint bucket of 2
+    assert client.get('/decorated').status_code == 200
+    assert client.get('/shared_a').status_code == 200
+    assert client.get('/shared_b').status_code == 200
+    assert client.get('/shared_a').status_code == 429
+
+
+def test_user_key_and_jwt_identity(app, limiter):
+    client = app.test_client()
+    with app.app_context():
+        token = create_access_token('1')
+
+    assert client.post('/login', json={'username': 'alice'}).status_code == 200
+    assert client.post('/login', json={'username': 'alice'}).status_code == 429
+    assert client.post('/login', json={'username': 'bob'}).status_code == 200
+
+    headers = {'Authorization': f'Bearer {token}'}
+    assert client.get('/me', headers=headers).status_code == 200
+    assert client.get('/me', headers=headers).status_code == 429
+    # anonymous requests have no user bucket
+    assert client.get('/me').status_code == 200
+
+
+def test_backend_errors_fail_open(app, limiter):
+    limiter.backend = FailingBackend()
+    client = app.test_client()
+
+    assert [client.get('/decorated').status_code for _ in range(3)] == [200, 200, 200]
+    assert limiter.get_stats()['backend_errors'] == 3
+    assert limiter.get_stats()['rejected'] == 0
+
+
+def test_disabled_limiter_lets_everything_through(app, limiter):
+    limiter.enabled = False
+    client = app.test_client()
+
+    assert [client.get('/decorated').status_code for _ in range(3)] == [200, 200, 200]
+
+
+def test_cors_preflight_does_not_spend_tokens(app, limiter):
+    client = app.test_client()
+
+    assert [client.options('/decorated').status_code for _ in range(3)] == [200, 200, 200]
+    assert client.get('/decorated').status_code == 200
+    assert limiter.get_stats()['rejected'] == 0
+
+
+def test_failing_user_key_skips_the_user_bucket(app, limiter):
+    client = app.test_client()
+
+    assert client.post('/login', json={}).status_code == 200
+    assert client.post('/login', data='not json').status_code == 200
+    assert limiter.get_stats()['user_key_errors'] == 2
+    assert limiter.get_stats()['rejected'] == 0